@@ -2,25 +2,377 @@
 File archiver module for managing old and unused files.
 """
 
+import mmap
 import os
 import shutil
+import threading
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set, Tuple
+
+# Files above this size bypass the parallel precompressed path and are
+# streamed into the archive in chunks instead: a worker holds its whole
+# deflate output in memory, and with a full in-flight window several
+# multi-GB blobs would be resident at once
+_PARALLEL_DEFLATE_LIMIT = 64 * 1024 * 1024
+
+# Per-thread compressor templates; copying a prebuilt compressobj is
+# cheaper than running full compressor initialization for every entry
+_compressor_cache = threading.local()
+
+
+def _fresh_compressor(level: int):
+    """Get a fresh raw-deflate compressor for this thread."""
+    templates = getattr(_compressor_cache, 'templates', None)
+    if templates is None:
+        templates = _compressor_cache.templates = {}
+    template = templates.get(level)
+    if template is None:
+        template = templates[level] = zlib.compressobj(
+            level, zlib.DEFLATED, -15)
+    return template.copy()
 
 
 class FileArchiver:
     """Archives old or unused files."""
 
-    def __init__(self, dry_run: bool = True):
+    def __init__(self, dry_run: bool = True, compress_level: int = 6):
         """
         Initialize the file archiver.
 
         Args:
             dry_run: If True, only simulate operations without making changes
+            compress_level: zlib compression level for zip archives
+                            (1 = fastest, 9 = smallest, 6 = default)
         """
         self.dry_run = dry_run
+        self.compress_level = compress_level
+
+    def _iter_old_files(self, source_path: Path,
+                        threshold: float) -> Iterator[Tuple[str, int]]:
+        """
+        Walk a directory tree and yield files older than a threshold.
+
+        Uses an explicit os.scandir() stack so that file type and stat
+        information come from the cached DirEntry, avoiding the extra
+        stat calls that Path.rglob() + is_file() + stat() would issue
+        per entry.
+
+        Args:
+            source_path: Root directory to walk
+            threshold: Access-time cutoff as a POSIX timestamp
+
+        Yields:
+            Tuples of (file path, file size) for old files
+        """
+        stack = deque([str(source_path)])
+
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                stat_info = entry.stat(follow_symlinks=False)
+                                if stat_info.st_atime < threshold:
+                                    yield entry.path, stat_info.st_size
+                        except (PermissionError, OSError):
+                            pass
+            except (PermissionError, OSError):
+                pass
+
+    def _iter_files_by_extension(self, source_path: Path,
+                                 extensions: Set[str]) -> Iterator[Tuple[str, int]]:
+        """
+        Walk a directory tree and yield files with matching extensions.
+
+        Extensions are matched on the DirEntry name directly (no Path
+        object per file), and sizes come from the cached DirEntry stat.
+
+        Args:
+            source_path: Root directory to walk
+            extensions: Set of lowercase extensions without the dot
+
+        Yields:
+            Tuples of (file path, file size) for matching files
+        """
+        stack = deque([str(source_path)])
+
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                # Match pathlib's suffix semantics: a
+                                # leading dot ('.bashrc') is not a suffix
+                                name = entry.name
+                                dot = name.rfind('.')
+                                if dot > 0 and name[dot + 1:].lower() in extensions:
+                                    stat_info = entry.stat(follow_symlinks=False)
+                                    yield entry.path, stat_info.st_size
+                        except (PermissionError, OSError):
+                            pass
+            except (PermissionError, OSError):
+                pass
+
+    @staticmethod
+    def _deflate_entry(file_path: Path, arcname: str,
+                       level: int = 6) -> Optional[Tuple[str, int, float, int, bytes]]:
+        """
+        Read and deflate one file for zip archiving.
+
+        Runs in a worker thread; zlib releases the GIL during
+        compression so workers scale across cores.
+
+        Args:
+            file_path: File to compress
+            arcname: Name the entry will have inside the archive
+            level: zlib compression level
+
+        Returns:
+            Tuple of (arcname, file size, mtime, CRC, raw deflate bytes),
+            or None if the file could not be read
+        """
+        try:
+            stat_info = os.stat(file_path)
+            with open(file_path, 'rb') as f:
+                # Tell the kernel we will read straight through, so it
+                # can prefetch aggressively while other workers deflate
+                if hasattr(os, 'posix_fadvise'):
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0,
+                                         os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass
+
+                if stat_info.st_size > 0:
+                    # Map the file instead of copying it into a Python
+                    # bytes object; zlib reads the pages directly
+                    with mmap.mmap(f.fileno(), 0,
+                                   access=mmap.ACCESS_READ) as mm:
+                        crc = zlib.crc32(mm)
+                        compressor = _fresh_compressor(level)
+                        compressed = compressor.compress(mm) + compressor.flush()
+                        file_size = len(mm)
+                else:
+                    crc = zlib.crc32(b"")
+                    compressed = _fresh_compressor(level).flush()
+                    file_size = 0
+        except (PermissionError, OSError, ValueError):
+            return None
+
+        return arcname, file_size, stat_info.st_mtime, crc, compressed
+
+    def _stream_zip_parallel(self, zip_path: Path,
+                             file_iter: Iterator[Tuple[str, int]],
+                             prefix_len: int, operations: List[Dict],
+                             delete_originals: bool = False) -> Tuple[int, int]:
+        """
+        Stream files from an iterator straight into a zip archive.
+
+        Runs as a bounded pipeline: the directory walk produces paths,
+        a thread pool deflates them concurrently, and the main thread
+        appends finished blobs in submission order. At most a few dozen
+        entries are in flight, and files larger than
+        _PARALLEL_DEFLATE_LIMIT skip the pool entirely and stream into
+        the archive in chunks, so memory stays bounded in both entry
+        count and bytes no matter how large the tree or its files are.
+        Originals are only deleted after the archive (including its
+        central directory) is fully written and closed, so a crash or
+        full disk mid-archive never costs data.
+
+        Args:
+            zip_path: Path of the zip file to create
+            file_iter: Iterator of (file path, size) tuples
+            prefix_len: Length of the source-path prefix to strip for
+                        archive names
+            operations: List that operation records are appended to
+            delete_originals: Unlink the archived files once the
+                              archive is complete
+
+        Returns:
+            Tuple of (files archived, total uncompressed size)
+        """
+        files_archived = 0
+        total_size = 0
+        window = deque()
+        max_inflight = (os.cpu_count() or 2) * 4
+        zip_name = str(zip_path)
+        archived_paths = []
+
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=self.compress_level) as zipf:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+
+                def drain_one():
+                    nonlocal files_archived, total_size
+                    path_str, future = window.popleft()
+                    result = future.result()
+                    if result is None:
+                        return
+
+                    arcname, file_size, mtime, crc, compressed = result
+                    info = zipfile.ZipInfo(
+                        arcname, date_time=time.localtime(mtime)[:6])
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.external_attr = 0o600 << 16
+
+                    self._append_precompressed(zipf, info, file_size,
+                                               crc, compressed)
+                    files_archived += 1
+                    total_size += file_size
+                    operations.append({
+                        'action': 'archived_to_zip',
+                        'source': path_str,
+                        'archive': zip_name
+                    })
+
+                    if delete_originals:
+                        archived_paths.append(path_str)
+
+                for path_str, size in file_iter:
+                    if size > _PARALLEL_DEFLATE_LIMIT:
+                        # Too big to hold deflated in memory; ZipFile
+                        # streams it in chunks on this thread while the
+                        # pool keeps working on small entries
+                        try:
+                            zipf.write(path_str, path_str[prefix_len:])
+                        except (PermissionError, OSError, ValueError):
+                            continue
+                        files_archived += 1
+                        total_size += size
+                        operations.append({
+                            'action': 'archived_to_zip',
+                            'source': path_str,
+                            'archive': zip_name
+                        })
+                        if delete_originals:
+                            archived_paths.append(path_str)
+                        continue
+
+                    window.append((
+                        path_str,
+                        executor.submit(self._deflate_entry, path_str,
+                                        path_str[prefix_len:],
+                                        self.compress_level)
+                    ))
+                    if len(window) >= max_inflight:
+                        drain_one()
+
+                while window:
+                    drain_one()
+
+        # The ZipFile is closed: the central directory is on disk and
+        # the archive is durable, so the originals are safe to remove
+        for path_str in archived_paths:
+            try:
+                os.unlink(path_str)
+            except (PermissionError, OSError) as e:
+                print(f"Warning: Could not delete {path_str}: {e}")
+
+        return files_archived, total_size
+
+    @staticmethod
+    def _append_precompressed(zipf: zipfile.ZipFile, info: zipfile.ZipInfo,
+                              file_size: int, crc: int, compressed: bytes):
+        """
+        Append an already-deflated blob to an open ZipFile.
+
+        ZipFile has no public API for pre-compressed data (writestr
+        would deflate again), so this writes the local file header and
+        raw deflate stream directly and registers the entry in the
+        central directory bookkeeping. Because CRC and both sizes are
+        known up front, the header is final on first write — no
+        seek-back to patch it, so the archive streams sequentially.
+
+        Args:
+            zipf: Open ZipFile in write mode
+            info: ZipInfo describing the entry (name, date, type)
+            file_size: Uncompressed size of the data
+            crc: CRC32 of the uncompressed data
+            compressed: Raw deflate bytes to append
+        """
+        info.file_size = file_size
+        info.CRC = crc
+        info.compress_size = len(compressed)
+        info.header_offset = zipf.fp.tell()
+
+        zip64 = (file_size >= zipfile.ZIP64_LIMIT or
+                 info.compress_size >= zipfile.ZIP64_LIMIT)
+        zipf.fp.write(info.FileHeader(zip64=zip64))
+        zipf.fp.write(compressed)
+
+        zipf.filelist.append(info)
+        zipf.NameToInfo[info.filename] = info
+        zipf.start_dir = zipf.fp.tell()
+
+    def _move_to_archive(self, files: List[Path], source_path: Path,
+                         archive_path: Path) -> List[Dict]:
+        """
+        Move files into the archive directory, preserving relative paths.
+
+        When source and archive live on the same device, files are moved
+        with os.rename directly instead of shutil.move (which stats the
+        destination and may fall back to copy+unlink). Parent directory
+        creation is deduplicated across files.
+
+        Args:
+            files: Files to move
+            source_path: Root the relative structure is computed from
+            archive_path: Destination archive root
+
+        Returns:
+            List of move operation records
+        """
+        operations = []
+
+        try:
+            same_dev = (os.stat(source_path).st_dev ==
+                        os.stat(archive_path).st_dev)
+        except OSError:
+            same_dev = False
+
+        made_dirs = set()
+
+        # The walkers only yield paths under source_path, so the
+        # relative part is a fixed-offset slice; Path.relative_to would
+        # re-parse and compare segments per file
+        prefix_len = len(str(source_path).rstrip(os.sep)) + 1
+
+        for file_path in files:
+            dest_path = archive_path / str(file_path)[prefix_len:]
+
+            if not self.dry_run:
+                parent = dest_path.parent
+                if parent not in made_dirs:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    made_dirs.add(parent)
+
+                if same_dev:
+                    os.rename(file_path, dest_path)
+                else:
+                    shutil.move(str(file_path), str(dest_path))
+
+            operations.append({
+                'action': 'moved_to_archive',
+                'source': str(file_path),
+                'destination': str(dest_path)
+            })
+
+        return operations
 
     def archive_old_files(self, source_dir: str, archive_dir: str,
                          days_threshold: int = 365,
@@ -39,80 +391,64 @@ class FileArchiver:
         """
         source_path = Path(source_dir)
         archive_path = Path(archive_dir)
-        threshold_date = datetime.now().timestamp() - (days_threshold * 24 * 60 * 60)
+        # Plain float comparison in the walk; no datetime objects needed
+        threshold_date = time.time() - days_threshold * 86400
 
-        old_files = []
-        total_size = 0
-
-        # Find old files
-        for file_path in source_path.rglob('*'):
-            if file_path.is_file():
-                try:
-                    stat_info = file_path.stat()
-                    if stat_info.st_atime < threshold_date:
-                        old_files.append(file_path)
-                        total_size += stat_info.st_size
-                except (PermissionError, OSError):
-                    pass
+        file_iter = self._iter_old_files(source_path, threshold_date)
 
         results = {
-            'files_archived': len(old_files),
-            'total_size': total_size,
+            'files_archived': 0,
+            'total_size': 0,
             'archive_path': None,
             'operations': []
         }
 
-        if not old_files:
-            return results
+        if compress and not self.dry_run:
+            # Stream the walk straight into the archive without
+            # materializing the old-file list
+            first = next(file_iter, None)
+            if first is None:
+                return results
 
-        if not self.dry_run:
             archive_path.mkdir(parents=True, exist_ok=True)
 
-        if compress:
-            # Create a zip archive
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            zip_name = f"archive_{timestamp}.zip"
-            zip_path = archive_path / zip_name
-
-            if not self.dry_run:
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in old_files:
-                        # Preserve relative path structure in archive
-                        arcname = file_path.relative_to(source_path)
-                        zipf.write(file_path, arcname)
+            zip_path = archive_path / f"archive_{timestamp}.zip"
 
-                        results['operations'].append({
-                            'action': 'archived_to_zip',
-                            'source': str(file_path),
-                            'archive': str(zip_path)
-                        })
-
-                # Delete original files after successful archiving
-                for file_path in old_files:
-                    try:
-                        file_path.unlink()
-                    except (PermissionError, OSError) as e:
-                        print(f"Warning: Could not delete {file_path}: {e}")
+            prefix_len = len(str(source_path).rstrip(os.sep)) + 1
+            count, total = self._stream_zip_parallel(
+                zip_path, chain([first], file_iter), prefix_len,
+                results['operations'], delete_originals=True)
 
+            results['files_archived'] = count
+            results['total_size'] = total
             results['archive_path'] = str(zip_path)
+            return results
 
-        else:
-            # Move files to archive directory
-            for file_path in old_files:
-                # Preserve relative path structure
-                rel_path = file_path.relative_to(source_path)
-                dest_path = archive_path / rel_path
+        old_files = []
+        total_size = 0
 
-                if not self.dry_run:
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(file_path), str(dest_path))
+        for path_str, size in file_iter:
+            old_files.append(Path(path_str))
+            total_size += size
 
-                results['operations'].append({
-                    'action': 'moved_to_archive',
-                    'source': str(file_path),
-                    'destination': str(dest_path)
-                })
+        results['files_archived'] = len(old_files)
+        results['total_size'] = total_size
 
+        if not old_files:
+            return results
+
+        if compress:
+            # Dry run: report the zip that would be created
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            results['archive_path'] = str(
+                archive_path / f"archive_{timestamp}.zip")
+        else:
+            # Move files to archive directory
+            if not self.dry_run:
+                archive_path.mkdir(parents=True, exist_ok=True)
+            results['operations'].extend(
+                self._move_to_archive(old_files, source_path, archive_path))
             results['archive_path'] = str(archive_path)
 
         return results
@@ -135,73 +471,67 @@ class FileArchiver:
         source_path = Path(source_dir)
         archive_path = Path(archive_dir)
 
-        files_to_archive = []
-        total_size = 0
+        # Normalize extensions to a lowercase, dot-free set for fast
+        # matching against DirEntry names
+        ext_set = frozenset(ext.lstrip('.').lower() for ext in extensions)
 
-        # Find files with matching extensions
-        for file_path in source_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in extensions:
-                files_to_archive.append(file_path)
-                try:
-                    total_size += file_path.stat().st_size
-                except (PermissionError, OSError):
-                    pass
+        file_iter = self._iter_files_by_extension(source_path, ext_set)
 
         results = {
-            'files_archived': len(files_to_archive),
-            'total_size': total_size,
+            'files_archived': 0,
+            'total_size': 0,
             'archive_path': None,
             'operations': []
         }
 
-        if not files_to_archive:
-            return results
+        if compress and not self.dry_run:
+            # Stream the walk straight into the archive; no file list
+            # is materialized and memory stays bounded
+            first = next(file_iter, None)
+            if first is None:
+                return results
 
-        if not self.dry_run:
             archive_path.mkdir(parents=True, exist_ok=True)
 
-        if compress:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             ext_str = '_'.join(ext.replace('.', '') for ext in extensions)
-            zip_name = f"archive_{ext_str}_{timestamp}.zip"
-            zip_path = archive_path / zip_name
-
-            if not self.dry_run:
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in files_to_archive:
-                        arcname = file_path.relative_to(source_path)
-                        zipf.write(file_path, arcname)
-
-                        results['operations'].append({
-                            'action': 'archived_to_zip',
-                            'source': str(file_path),
-                            'archive': str(zip_path)
-                        })
+            zip_path = archive_path / f"archive_{ext_str}_{timestamp}.zip"
 
-                # Delete original files
-                for file_path in files_to_archive:
-                    try:
-                        file_path.unlink()
-                    except (PermissionError, OSError) as e:
-                        print(f"Warning: Could not delete {file_path}: {e}")
+            prefix_len = len(str(source_path).rstrip(os.sep)) + 1
+            count, total = self._stream_zip_parallel(
+                zip_path, chain([first], file_iter), prefix_len,
+                results['operations'], delete_originals=True)
 
+            results['files_archived'] = count
+            results['total_size'] = total
             results['archive_path'] = str(zip_path)
+            return results
 
-        else:
-            for file_path in files_to_archive:
-                rel_path = file_path.relative_to(source_path)
-                dest_path = archive_path / rel_path
+        files_to_archive = []
+        total_size = 0
 
-                if not self.dry_run:
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(file_path), str(dest_path))
+        for path_str, size in file_iter:
+            files_to_archive.append(Path(path_str))
+            total_size += size
 
-                results['operations'].append({
-                    'action': 'moved_to_archive',
-                    'source': str(file_path),
-                    'destination': str(dest_path)
-                })
+        results['files_archived'] = len(files_to_archive)
+        results['total_size'] = total_size
 
+        if not files_to_archive:
+            return results
+
+        if compress:
+            # Dry run: report the zip that would be created
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            ext_str = '_'.join(ext.replace('.', '') for ext in extensions)
+            results['archive_path'] = str(
+                archive_path / f"archive_{ext_str}_{timestamp}.zip")
+        else:
+            if not self.dry_run:
+                archive_path.mkdir(parents=True, exist_ok=True)
+            results['operations'].extend(
+                self._move_to_archive(files_to_archive, source_path,
+                                      archive_path))
             results['archive_path'] = str(archive_path)
 
         return results
@@ -216,20 +546,76 @@ class FileArchiver:
         Returns:
             List of removed directories
         """
-        dir_path = Path(directory)
         removed_dirs = []
+        self._walk_collect_empty(str(directory), removed_dirs, is_root=True)
+        return removed_dirs
 
-        # Walk bottom-up to remove nested empty directories
-        for root, dirs, files in os.walk(dir_path, topdown=False):
-            for dir_name in dirs:
-                dir_to_check = Path(root) / dir_name
-                try:
-                    # Check if directory is empty
-                    if not any(dir_to_check.iterdir()):
-                        if not self.dry_run:
-                            dir_to_check.rmdir()
-                        removed_dirs.append(str(dir_to_check))
-                except (PermissionError, OSError):
-                    pass
+    def _walk_collect_empty(self, directory: str, removed_dirs: List[str],
+                            is_root: bool = False) -> bool:
+        """
+        Remove empty directories in a single scandir pass per directory.
 
-        return removed_dirs
+        Each directory is opened exactly once; emptiness is determined
+        from the entries already read (and from whether subdirectories
+        were themselves removed), so no second iterdir() pass is
+        needed. The walk uses an explicit stack like the other tree
+        walkers in this module, so arbitrarily deep trees never hit the
+        interpreter recursion limit.
+
+        Args:
+            directory: Directory to process
+            removed_dirs: List collecting removed directory paths
+            is_root: Whether this is the top-level directory (never removed)
+
+        Returns:
+            True if the directory is (or would be) empty after cleanup
+        """
+        # Pass 1: pre-order walk recording, per readable directory,
+        # whether it holds files directly and which subdirectories it
+        # has. Unreadable directories are left out and treated as
+        # non-empty below.
+        info = {}
+        order = []
+        stack = [directory]
+
+        while stack:
+            current = stack.pop()
+            has_files = False
+            subdirs = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        else:
+                            has_files = True
+            except (PermissionError, OSError):
+                continue
+            info[current] = (has_files, subdirs)
+            order.append(current)
+            stack.extend(subdirs)
+
+        # Pass 2: every directory was pushed after its parent, so the
+        # reversed visit order reaches each directory only after all of
+        # its subdirectories (post-order)
+        empty = {}
+
+        for current in reversed(order):
+            has_files, subdirs = info[current]
+            if has_files or not all(empty.get(s, False) for s in subdirs):
+                empty[current] = False
+                continue
+
+            if is_root and current == directory:
+                empty[current] = True
+                continue
+
+            try:
+                if not self.dry_run:
+                    os.rmdir(current)
+                removed_dirs.append(current)
+                empty[current] = True
+            except (PermissionError, OSError):
+                empty[current] = False
+
+        return empty.get(directory, False)
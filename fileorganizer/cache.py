@@ -0,0 +1,251 @@
+"""
+Scan result caching to avoid re-scanning unchanged directories.
+"""
+
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+# Cache keys only need a fast, well-distributed hash, not a
+# cryptographic one. xxh3 is vectorized and much faster than MD5 for
+# short strings; without xxhash, truncated SHA-256 is the fallback
+# (hardware-accelerated via SHA-NI on modern CPUs, unlike MD5).
+try:
+    import xxhash
+
+    def _hash_dir(directory: str) -> str:
+        return xxhash.xxh3_64_hexdigest(directory)
+except ImportError:
+    def _hash_dir(directory: str) -> str:
+        return hashlib.sha256(directory.encode()).hexdigest()[:16]
+
+# Binary cache format: msgpack serialization compressed with zstd.
+# Both are optional dependencies; JSON files are used when either is
+# missing so the cache keeps working in minimal installs.
+try:
+    import msgpack
+    import zstandard
+    HAS_BINARY_CACHE = True
+except ImportError:
+    msgpack = None
+    zstandard = None
+    HAS_BINARY_CACHE = False
+
+
+class ScanCache:
+    """Caches directory scan results on disk."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the scan cache.
+
+        Args:
+            cache_dir: Directory to store cache files
+                       (defaults to ~/.fileorganizer/cache)
+        """
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            self.cache_dir = Path.home() / '.fileorganizer' / 'cache'
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Per-directory {path: file_info} indexes, built lazily the
+        # first time a single-file lookup is requested
+        self._index_cache = {}
+
+        # Parsed payloads keyed by directory, so is_cached-then-get
+        # call patterns deserialize each entry at most once per process
+        self._payload_cache = {}
+
+    @lru_cache(maxsize=256)
+    def _get_cache_file(self, directory: str) -> Path:
+        """
+        Get the cache file path for a directory.
+
+        Memoized so repeat calls for the same directory (is_cached
+        followed by get, for example) do not re-resolve and re-hash.
+
+        Args:
+            directory: Directory the cache entry belongs to
+
+        Returns:
+            Path to the cache file
+        """
+        dir_hash = _hash_dir(str(Path(directory).resolve()))
+        suffix = 'mpz' if HAS_BINARY_CACHE else 'json'
+        return self.cache_dir / f"scan_{dir_hash}.{suffix}"
+
+    def set(self, directory: str, scan_results: Dict,
+            options: Optional[Dict] = None):
+        """
+        Store scan results for a directory.
+
+        Args:
+            directory: Directory that was scanned
+            scan_results: Results from FileScanner.scan()
+            options: Scan options the results were produced with
+                     (compared on get, so an entry is never served to a
+                     caller that asked for a different scan)
+        """
+        cached_data = {
+            'directory': str(Path(directory).resolve()),
+            'cached_at': time.time(),
+            'options': options,
+            'results': scan_results,
+        }
+
+        self._index_cache.pop(directory, None)
+        self._payload_cache.pop(directory, None)
+        cache_file = self._get_cache_file(directory)
+
+        # Write-then-rename so a run killed mid-write can never leave a
+        # truncated entry behind under the real name
+        tmp_file = cache_file.with_suffix(cache_file.suffix + '.tmp')
+
+        if HAS_BINARY_CACHE:
+            buf = msgpack.packb(cached_data, use_bin_type=True)
+            compressor = zstandard.ZstdCompressor(level=3)
+            tmp_file.write_bytes(compressor.compress(buf))
+        else:
+            with open(tmp_file, 'w') as f:
+                json.dump(cached_data, f)
+
+        os.replace(tmp_file, cache_file)
+
+    def get(self, directory: str,
+            max_age_seconds: Optional[float] = None,
+            newer_than: Optional[float] = None,
+            options: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Retrieve cached scan results for a directory.
+
+        Args:
+            directory: Directory to look up
+            max_age_seconds: Maximum age of the cache entry, or None
+                             to accept any age
+            newer_than: Reject entries cached before this POSIX
+                        timestamp (e.g. the directory's st_mtime)
+            options: Scan options the caller needs; entries stored with
+                     different options (or none, for pre-options
+                     entries) are rejected
+
+        Returns:
+            Cached scan results, or None if missing, stale or unreadable
+        """
+        cached_data = self._payload_cache.get(directory)
+
+        if cached_data is None:
+            cache_file = self._get_cache_file(directory)
+
+            if not cache_file.exists():
+                return None
+
+            try:
+                if HAS_BINARY_CACHE:
+                    data = cache_file.read_bytes()
+                    decompressor = zstandard.ZstdDecompressor()
+                    cached_data = msgpack.unpackb(
+                        decompressor.decompress(data), raw=False)
+                else:
+                    with open(cache_file, 'r') as f:
+                        cached_data = json.load(f)
+            except Exception:
+                # Corrupt or truncated entries (zstandard and msgpack
+                # raise their own exception types, not ValueError) are
+                # a cache miss, never a fatal error
+                return None
+
+            self._payload_cache[directory] = cached_data
+
+        cached_at = cached_data.get('cached_at', 0)
+
+        if max_age_seconds is not None:
+            if time.time() - cached_at > max_age_seconds:
+                return None
+
+        if newer_than is not None and cached_at < newer_than:
+            return None
+
+        if options is not None and cached_data.get('options') != options:
+            return None
+
+        return cached_data.get('results')
+
+    def is_cached(self, directory: str,
+                  max_age_seconds: Optional[float] = None) -> bool:
+        """
+        Check whether a fresh cache entry exists for a directory.
+
+        Args:
+            directory: Directory to look up
+            max_age_seconds: Maximum age of the cache entry
+
+        Returns:
+            True if a usable cache entry exists
+        """
+        if directory in self._payload_cache:
+            cached_at = self._payload_cache[directory].get('cached_at', 0)
+        else:
+            cache_file = self._get_cache_file(directory)
+            try:
+                cached_at = cache_file.stat().st_mtime
+            except OSError:
+                return False
+
+        if max_age_seconds is not None:
+            return time.time() - cached_at <= max_age_seconds
+
+        return True
+
+    def get_file_from_cache(self, directory: str,
+                            file_path: str) -> Optional[Dict]:
+        """
+        Look up a single file's info in a cached scan.
+
+        Args:
+            directory: Directory the scan covered
+            file_path: Path of the file to look up
+
+        Returns:
+            Cached file info dict, or None if not cached
+        """
+        if directory not in self._index_cache:
+            results = self.get(directory)
+            if not results:
+                return None
+            self._index_cache[directory] = {
+                file_info['path']: file_info
+                for file_info in results.get('files', [])
+            }
+
+        return self._index_cache[directory].get(file_path)
+
+    def invalidate(self, directory: str):
+        """
+        Remove the cache entry for a directory.
+
+        Args:
+            directory: Directory whose cache entry should be removed
+        """
+        self._index_cache.pop(directory, None)
+        self._payload_cache.pop(directory, None)
+        cache_file = self._get_cache_file(directory)
+        try:
+            cache_file.unlink()
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove all cache entries."""
+        self._index_cache.clear()
+        self._payload_cache.clear()
+        for cache_file in self.cache_dir.glob('scan_*'):
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
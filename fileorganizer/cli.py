@@ -4,24 +4,210 @@ Command-line interface for the File Organization Assistant.
 """
 
 import argparse
-import json
 import sys
-from pathlib import Path
-from typing import Optional
+from functools import lru_cache
 
-from .scanner import FileScanner
-from .organizer import FileOrganizer
-from .archiver import FileArchiver
-from .duplicates import DuplicateManager
+from .logger import get_logger
 
+# Cached once at import; repeated get_logger calls per command would
+# redo the name lookup for no benefit
+logger = get_logger(__name__)
 
+# Submodule imports happen inside the command functions that need them,
+# so --help and argument errors don't pay for loading the whole package
+
+# Maximum age of a cached scan before commands fall back to rescanning
+CACHE_MAX_AGE_SECONDS = 3600
+
+
+def _by_group_size(item):
+    """Sort key for (key, files) pairs: the number of files."""
+    return len(item[1])
+
+
+def _get_scan_results(directory, exclude=None, include_hidden=False,
+                      force_rescan=False, hash_algo='auto'):
+    """
+    Get scan results for a directory, reusing a fresh cache entry when
+    possible.
+
+    Args:
+        directory: Directory to scan
+        exclude: Directories to exclude from scanning
+        include_hidden: Whether to include hidden files
+        force_rescan: Skip the cache and always rescan
+        hash_algo: Content hash algorithm for the scanner
+
+    Returns:
+        Tuple of (scan results, True if served from cache)
+    """
+    from .scanner import FileScanner
+    from .cache import ScanCache
+
+    import os
+
+    cache = ScanCache()
+
+    # Entries are only valid for the exact scan options they were
+    # produced with; a cached unexcluded scan must never answer an
+    # --exclude request (and likewise for hidden files and the hash
+    # algorithm)
+    options = {
+        'exclude': sorted(exclude) if exclude else [],
+        'include_hidden': bool(include_hidden),
+        'hash_algo': hash_algo,
+    }
+
+    if not force_rescan:
+        # A cache entry older than the directory itself means files
+        # were added or removed at the top level since the scan
+        try:
+            dir_mtime = os.stat(directory).st_mtime
+        except OSError:
+            dir_mtime = None
+
+        results = cache.get(directory, max_age_seconds=CACHE_MAX_AGE_SECONDS,
+                            newer_than=dir_mtime, options=options)
+        if results is not None:
+            return results, True
+
+    from .database import Database
+
+    import time
+
+    hash_db = Database()
+    # monotonic_ns is immune to wall-clock adjustments and returns a
+    # plain int, unlike datetime arithmetic
+    start_ns = time.monotonic_ns()
+    try:
+        scanner = FileScanner(directory, exclude_dirs=exclude,
+                              hash_algo=hash_algo, hash_db=hash_db)
+        results = scanner.scan(include_hidden=include_hidden)
+    finally:
+        hash_db.close()
+
+    results['scan_duration_seconds'] = (time.monotonic_ns() - start_ns) / 1e9
+
+    cache.set(directory, results, options=options)
+    return results, False
+
+
+def _verify_cached_duplicates(duplicates):
+    """
+    Re-check cached duplicate groups against the filesystem.
+
+    Cached hashes can be up to an hour old and the directory-mtime
+    guard does not see in-place content edits, so before acting
+    destructively on cached results every file is re-stated: entries
+    whose size or mtime no longer match (or that are gone) are dropped,
+    along with any group left without duplicates.
+
+    Args:
+        duplicates: Hash -> file list mapping from cached scan results
+
+    Returns:
+        Tuple of (verified duplicates dict, number of files dropped)
+    """
+    import os
+    from .scanner import _isoformat
+
+    verified = {}
+    dropped = 0
+
+    for hash_val, files in duplicates.items():
+        fresh = []
+        for file_info in files:
+            try:
+                stat_info = os.stat(file_info['path'])
+            except OSError:
+                dropped += 1
+                continue
+            if (stat_info.st_size == file_info['size'] and
+                    _isoformat(stat_info.st_mtime) == file_info['modified']):
+                fresh.append(file_info)
+            else:
+                dropped += 1
+        if len(fresh) > 1:
+            verified[hash_val] = fresh
+
+    return verified, dropped
+
+
+# Unit buckets and reciprocal scale factors for format_size; indexed by
+# (bit_length - 1) // 10 so no division loop is needed
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_SIZE_SCALES = tuple(1.0 / (1 << (i * 10)) for i in range(6))
+
+
+def _write_json(output_path, data):
+    """
+    Write data to a JSON file, using orjson when installed.
+
+    orjson serializes large scan results several times faster than the
+    stdlib encoder and writes bytes directly.
+
+    Args:
+        output_path: File to write
+        data: JSON-serializable data
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+        with open(output_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return
+
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def _log_operations(operations, dry_run=False):
+    """
+    Record completed file operations in the database, one transaction
+    for the whole batch.
+
+    Args:
+        operations: Operation record dicts
+        dry_run: Skip logging (nothing actually happened)
+    """
+    if dry_run or not operations:
+        return
+
+    from .database import Database
+
+    db = Database()
+    try:
+        db.log_file_operations_bulk(operations)
+    finally:
+        db.close()
+
+
+def _confirm(prompt: str, assume_yes: bool = False) -> bool:
+    """
+    Ask for confirmation on stdin.
+
+    Args:
+        prompt: Question to display
+        assume_yes: Skip the prompt entirely (for scripted runs)
+
+    Returns:
+        True if the user confirmed
+    """
+    if assume_yes:
+        return True
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    return sys.stdin.readline().strip().lower().startswith('y')
+
+
+@lru_cache(maxsize=4096)
 def format_size(size_bytes: int) -> str:
     """Format bytes into human-readable size."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
+    if size_bytes <= 0:
+        return "0.00 B"
+    bucket = min(5, (int(size_bytes).bit_length() - 1) // 10)
+    return f"{size_bytes * _SIZE_SCALES[bucket]:.2f} {_SIZE_UNITS[bucket]}"
 
 
 def print_header(text: str):
@@ -39,31 +225,57 @@ def print_section(text: str):
 
 def cmd_scan(args):
     """Execute the scan command."""
+    import heapq
+
     print_header(f"Scanning Directory: {args.directory}")
 
-    scanner = FileScanner(args.directory, exclude_dirs=args.exclude)
-    results = scanner.scan(include_hidden=args.include_hidden)
+    results, from_cache = _get_scan_results(
+        args.directory, exclude=args.exclude,
+        include_hidden=args.include_hidden, force_rescan=args.force_rescan,
+        hash_algo=args.hash_algo)
+
+    if from_cache:
+        print("(using cached scan results; pass --force-rescan to rescan)\n")
 
     print(f"Files scanned: {results['file_count']:,}")
     print(f"Total size: {format_size(results['total_size'])}")
     print(f"Scan completed: {results['scan_date']}")
+    if 'scan_duration_seconds' in results:
+        print(f"Scan duration: {results['scan_duration_seconds']:.2f}s")
+    if results.get('hardlink_hits'):
+        print(f"Hardlinked files deduplicated: {results['hardlink_hits']:,}")
 
     # Show file type distribution
     print_section("File Types Distribution")
     by_extension = results['by_extension']
-    sorted_extensions = sorted(by_extension.items(), key=lambda x: len(x[1]), reverse=True)
+    top_extensions = heapq.nlargest(10, by_extension.items(),
+                                    key=_by_group_size)
+
+    # Per-extension totals are accumulated during the scan; the old
+    # cache format lacks them, so fall back to summing in that case
+    extension_sizes = results.get('extension_sizes')
 
-    for ext, files in sorted_extensions[:10]:  # Show top 10
+    # Collect rows and emit them in one write instead of a print (and
+    # potentially a syscall) per line
+    lines = []
+    for ext, files in top_extensions:
         count = len(files)
-        total_size = sum(f['size'] for f in files)
-        print(f"  {ext:20s} {count:6,} files  {format_size(total_size):>10s}")
+        if extension_sizes is not None:
+            total_size = extension_sizes[ext]
+        else:
+            total_size = sum(f['size'] for f in files)
+        lines.append(f"  {ext:20s} {count:6,} files  {format_size(total_size):>10s}")
 
-    if len(sorted_extensions) > 10:
-        print(f"  ... and {len(sorted_extensions) - 10} more types")
+    if len(by_extension) > 10:
+        lines.append(f"  ... and {len(by_extension) - 10} more types")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Show duplicates if found
     duplicates = results['duplicates']
     if duplicates:
+        from .duplicates import DuplicateManager
+
         print_section("Duplicate Files Found")
         duplicate_manager = DuplicateManager()
         dup_analysis = duplicate_manager.analyze_duplicates(duplicates)
@@ -73,30 +285,54 @@ def cmd_scan(args):
         print(f"  Wasted space: {format_size(dup_analysis['wasted_space'])}")
 
         if args.show_duplicates:
-            print("\n  Top duplicate groups:")
-            sorted_dups = sorted(duplicates.items(), key=lambda x: len(x[1]), reverse=True)
-            for hash_val, files in sorted_dups[:5]:
-                print(f"\n    {len(files)} copies ({format_size(files[0]['size'])} each):")
+            from operator import itemgetter
+
+            # Score each group once up front so the heap comparisons
+            # work on plain ints instead of re-deriving wasted space
+            scored = [(files[0]['size'] * (len(files) - 1), files)
+                      for files in duplicates.values()]
+            top_dups = heapq.nlargest(5, scored, key=itemgetter(0))
+
+            lines = ["\n  Top duplicate groups:"]
+            for wasted, files in top_dups:
+                lines.append(
+                    f"\n    {len(files)} copies ({format_size(files[0]['size'])} each, "
+                    f"{format_size(wasted)} wasted):")
                 for file_info in files[:3]:  # Show first 3
-                    print(f"      - {file_info['path']}")
+                    lines.append(f"      - {file_info['path']}")
                 if len(files) > 3:
-                    print(f"      ... and {len(files) - 3} more")
+                    lines.append(f"      ... and {len(files) - 3} more")
+
+            sys.stdout.write("\n".join(lines) + "\n")
 
     # Save results if requested
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(results, f, indent=2)
+        _write_json(args.output, results)
         print(f"\nResults saved to: {args.output}")
 
 
 def cmd_duplicates(args):
     """Execute the duplicates command."""
+    from .duplicates import DuplicateManager
+
     print_header(f"Finding Duplicates in: {args.directory}")
 
-    scanner = FileScanner(args.directory, exclude_dirs=args.exclude)
-    results = scanner.scan()
+    results, from_cache = _get_scan_results(
+        args.directory, exclude=args.exclude,
+        force_rescan=args.force_rescan, hash_algo=args.hash_algo)
+
+    if from_cache:
+        print("(using cached scan results; pass --force-rescan to rescan)\n")
+
     duplicates = results['duplicates']
 
+    # Never delete or move files based purely on stale cached hashes
+    if from_cache and args.action in ('remove', 'move'):
+        duplicates, dropped = _verify_cached_duplicates(duplicates)
+        if dropped:
+            print(f"(ignoring {dropped} cached entries that changed "
+                  f"on disk; pass --force-rescan for fresh results)\n")
+
     if not duplicates:
         print("No duplicate files found!")
         return
@@ -116,15 +352,38 @@ def cmd_duplicates(args):
     elif args.action == 'remove':
         if args.dry_run:
             print("\n[DRY RUN MODE - No files will be deleted]")
+        elif not _confirm(
+                f"\nDelete {analysis['total_duplicate_files']} duplicate "
+                f"files ({format_size(analysis['wasted_space'])})? [y/N]: ",
+                assume_yes=args.yes):
+            print("Aborted.")
+            return
 
-        operations = duplicate_manager.remove_duplicates(duplicates, keep_strategy=args.keep)
-        print(f"\nRemoved {len(operations)} duplicate files")
+        operations = duplicate_manager.remove_duplicates(
+            duplicates, keep_strategy=args.keep, workers=args.workers)
+        _log_operations(operations, dry_run=args.dry_run)
+
+        # One summary line (and log record) instead of a print and a
+        # stdout flush per deleted file
+        failed = [op for op in operations if op['status'] == 'failed']
+        removed = len(operations) - len(failed)
+        print(f"\nRemoved {removed} duplicate files")
+        logger.info("Removed %d duplicates (%d failed)", removed, len(failed))
+
+        if failed:
+            lines = [f"\n{len(failed)} deletions failed:"]
+            lines.extend(f"  {op['path']}: {op.get('error', 'unknown error')}"
+                         for op in failed[:10])
+            if len(failed) > 10:
+                lines.append(f"  ... and {len(failed) - 10} more")
+            sys.stdout.write("\n".join(lines) + "\n")
 
         if args.verbose:
-            for op in operations[:10]:  # Show first 10
-                print(f"  {op['status'].upper()}: {op['path']}")
+            lines = [f"  {op['status'].upper()}: {op['path']}"
+                     for op in operations[:10]]  # Show first 10
             if len(operations) > 10:
-                print(f"  ... and {len(operations) - 10} more")
+                lines.append(f"  ... and {len(operations) - 10} more")
+            sys.stdout.write("\n".join(lines) + "\n")
 
     elif args.action == 'move':
         if not args.target:
@@ -137,11 +396,14 @@ def cmd_duplicates(args):
         operations = duplicate_manager.move_duplicates(
             duplicates, args.target, keep_strategy=args.keep
         )
+        _log_operations(operations, dry_run=args.dry_run)
         print(f"\nMoved {len(operations)} duplicate files to {args.target}")
 
 
 def cmd_organize(args):
     """Execute the organize command."""
+    from .organizer import FileOrganizer
+
     print_header(f"Organizing Files in: {args.directory}")
 
     if args.dry_run:
@@ -171,6 +433,8 @@ def cmd_organize(args):
 
 def cmd_rename(args):
     """Execute the rename command."""
+    from .organizer import FileOrganizer
+
     print_header(f"Renaming Files in: {args.directory}")
 
     if args.dry_run:
@@ -197,12 +461,15 @@ def cmd_rename(args):
 
 def cmd_archive(args):
     """Execute the archive command."""
+    from .archiver import FileArchiver
+
     print_header(f"Archiving Files in: {args.directory}")
 
     if args.dry_run:
         print("[DRY RUN MODE - No files will be archived]\n")
 
-    archiver = FileArchiver(dry_run=args.dry_run)
+    archiver = FileArchiver(dry_run=args.dry_run,
+                            compress_level=args.compress_level)
 
     if args.mode == 'old':
         results = archiver.archive_old_files(
@@ -277,6 +544,10 @@ Examples:
     scan_parser.add_argument('--include-hidden', action='store_true', help='Include hidden files')
     scan_parser.add_argument('--show-duplicates', action='store_true', help='Show duplicate files')
     scan_parser.add_argument('--output', '-o', help='Save results to JSON file')
+    scan_parser.add_argument('--force-rescan', action='store_true',
+                            help='Ignore cached scan results')
+    scan_parser.add_argument('--hash-algo', choices=['auto', 'blake3', 'sha256', 'md5'],
+                            default='auto', help='Content hash algorithm')
     scan_parser.set_defaults(func=cmd_scan)
 
     # Duplicates command
@@ -289,6 +560,14 @@ Examples:
     dup_parser.add_argument('--target', help='Target directory for move action')
     dup_parser.add_argument('--report', help='Report file name')
     dup_parser.add_argument('--exclude', nargs='+', help='Directories to exclude')
+    dup_parser.add_argument('--force-rescan', action='store_true',
+                           help='Ignore cached scan results')
+    dup_parser.add_argument('--yes', '-y', action='store_true',
+                           help='Do not prompt for confirmation')
+    dup_parser.add_argument('--hash-algo', choices=['auto', 'blake3', 'sha256', 'md5'],
+                           default='auto', help='Content hash algorithm')
+    dup_parser.add_argument('--workers', type=int, default=None,
+                            help='Threads for parallel deletion (default: CPU count, max 8)')
     dup_parser.add_argument('--dry-run', action='store_true', help='Simulate without making changes')
     dup_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     dup_parser.set_defaults(func=cmd_duplicates)
@@ -325,6 +604,8 @@ Examples:
                            help='Days threshold for old mode')
     arc_parser.add_argument('--extensions', nargs='+', help='File extensions for extension mode')
     arc_parser.add_argument('--no-compress', action='store_true', help='Do not compress archive')
+    arc_parser.add_argument('--compress-level', type=int, default=6, choices=range(1, 10),
+                           metavar='1-9', help='Compression level (1=fastest, 9=smallest)')
     arc_parser.add_argument('--cleanup-empty', action='store_true', help='Remove empty directories')
     arc_parser.add_argument('--dry-run', action='store_true', help='Simulate without making changes')
     arc_parser.set_defaults(func=cmd_archive)
@@ -339,6 +620,7 @@ Examples:
         args.func(args)
         return 0
     except Exception as e:
+        logger.debug("Command %s failed", args.command, exc_info=True)
         print(f"\nError: {e}", file=sys.stderr)
         if hasattr(args, 'verbose') and args.verbose:
             import traceback
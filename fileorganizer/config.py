@@ -2,12 +2,45 @@
 Configuration management for File Organization Assistant.
 """
 
+import copy
+import hashlib
 import json
-import yaml
+import pickle
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional
 
 
+def _yaml_safe_loader(yaml):
+    """
+    Pick the fastest safe YAML loader available.
+
+    The libyaml-backed CSafeLoader parses roughly 10x faster than the
+    pure-Python one but is only present when PyYAML was built against
+    libyaml.
+
+    Args:
+        yaml: The imported yaml module
+
+    Returns:
+        Loader class for yaml.load
+    """
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _yaml_safe_dumper(yaml):
+    """
+    Pick the fastest safe YAML dumper available.
+
+    Args:
+        yaml: The imported yaml module
+
+    Returns:
+        Dumper class for yaml.dump
+    """
+    return getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
 class Config:
     """Manage configuration for file organization tasks."""
 
@@ -37,6 +70,10 @@ class Config:
         }
     }
 
+    # Shared read-only view of the defaults; instances alias this until
+    # their first mutation
+    _DEFAULT_VIEW = MappingProxyType(DEFAULT_CONFIG)
+
     def __init__(self, config_path: Optional[str] = None):
         """
         Initialize configuration.
@@ -44,7 +81,14 @@ class Config:
         Args:
             config_path: Path to configuration file (JSON or YAML)
         """
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Copy-on-write: read-only callers share the default tree
+        # behind a proxy; a mutable deep copy is only made when load or
+        # set actually needs one. The old shallow copy also aliased
+        # nested dicts across instances, so mutations leaked between
+        # Config objects.
+        self.config = self._DEFAULT_VIEW
+        self._owns_config = False
+        self._flat = self._flatten(self.config)
 
         if config_path:
             self.load(config_path)
@@ -58,19 +102,34 @@ class Config:
         """
         path = Path(config_path)
 
-        if not path.exists():
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-        with open(path, 'r') as f:
-            if path.suffix in ['.yaml', '.yml']:
-                loaded_config = yaml.safe_load(f)
-            elif path.suffix == '.json':
-                loaded_config = json.load(f)
-            else:
-                raise ValueError(f"Unsupported configuration format: {path.suffix}")
+        # Parsing (especially YAML) dominates short CLI runs, so the
+        # parsed dict is memoized in a pickle sidecar keyed by the
+        # source file's mtime
+        loaded_config = self._load_parse_cache(path, mtime_ns)
 
-        # Merge with defaults
+        if loaded_config is None:
+            with open(path, 'r') as f:
+                if path.suffix in ['.yaml', '.yml']:
+                    # Imported lazily so JSON-only use never pays the
+                    # yaml module load cost
+                    import yaml
+                    loaded_config = yaml.load(f, Loader=_yaml_safe_loader(yaml))
+                elif path.suffix == '.json':
+                    loaded_config = json.load(f)
+                else:
+                    raise ValueError(f"Unsupported configuration format: {path.suffix}")
+
+            self._save_parse_cache(path, mtime_ns, loaded_config)
+
+        # Merge with defaults and rebuild the flat lookup view
+        self._materialize()
         self._deep_update(self.config, loaded_config)
+        self._flat = self._flatten(self.config)
 
     def save(self, config_path: str, format: str = 'yaml'):
         """
@@ -83,11 +142,17 @@ class Config:
         path = Path(config_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Serializers reject MappingProxyType; a shallow dict view is
+        # enough since only the top level may be proxied
+        config = dict(self.config)
+
         with open(path, 'w') as f:
             if format == 'yaml':
-                yaml.dump(self.config, f, default_flow_style=False, indent=2)
+                import yaml
+                yaml.dump(config, f, Dumper=_yaml_safe_dumper(yaml),
+                          default_flow_style=False, indent=2)
             elif format == 'json':
-                json.dump(self.config, f, indent=2)
+                json.dump(config, f, indent=2)
             else:
                 raise ValueError(f"Unsupported format: {format}")
 
@@ -102,35 +167,138 @@ class Config:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
-        value = self.config
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
+        # Keys are pre-flattened at load time, so a get is a single
+        # dict lookup instead of a split and per-segment walk
+        return self._flat.get(key, default)
 
     def set(self, key: str, value):
         """
         Set a configuration value.
 
+        Updates both the nested dict (kept for save) and the flat
+        lookup view.
+
         Args:
             key: Configuration key (can use dot notation)
             value: Value to set
         """
+        self._materialize()
+
         keys = key.split('.')
         config = self.config
+        rebuild = False
 
-        for k in keys[:-1]:
-            if k not in config:
+        for i, k in enumerate(keys[:-1]):
+            if not isinstance(config.get(k), dict):
+                # An intermediate segment replaces a scalar (or is
+                # created); the shape under this prefix changed
+                rebuild = rebuild or k in config
                 config[k] = {}
             config = config[k]
+            # Intermediate dicts stay addressable by their dotted prefix
+            self._flat['.'.join(keys[:i + 1])] = config
 
+        old_value = config.get(keys[-1])
         config[keys[-1]] = value
 
+        if rebuild or isinstance(old_value, dict) or isinstance(value, dict):
+            # Replacing a subtree invalidates every flat entry beneath
+            # it; rebuilding the view is simpler and safer than purging
+            # stale dotted prefixes one by one
+            self._flat = self._flatten(self.config)
+        else:
+            self._flat[key] = value
+
+    def _materialize(self):
+        """
+        Replace the shared default tree with a private deep copy.
+
+        Called before any mutation; read-only Config instances never
+        pay for the copy.
+        """
+        if not self._owns_config:
+            self.config = copy.deepcopy(dict(self.config))
+            self._owns_config = True
+
+    @staticmethod
+    def _parse_cache_file(path: Path) -> Path:
+        """
+        Get the parse-cache sidecar path for a config file.
+
+        Args:
+            path: Resolved config file path
+
+        Returns:
+            Path to the pickle sidecar under ~/.fileorganizer/cache
+        """
+        path_hash = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]
+        return Path.home() / '.fileorganizer' / 'cache' / f"config_{path_hash}.pkl"
+
+    def _load_parse_cache(self, path: Path, mtime_ns: int) -> Optional[dict]:
+        """
+        Load a memoized parse of a config file, if still fresh.
+
+        Args:
+            path: Config file path
+            mtime_ns: Current mtime of the config file
+
+        Returns:
+            The parsed config dict, or None on miss or staleness
+        """
+        cache_file = self._parse_cache_file(path)
+        try:
+            with open(cache_file, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+        if entry.get('mtime_ns') != mtime_ns:
+            return None
+        return entry.get('data')
+
+    def _save_parse_cache(self, path: Path, mtime_ns: int, data: dict):
+        """
+        Store a parsed config in the sidecar cache (best effort).
+
+        Args:
+            path: Config file path
+            mtime_ns: mtime of the config file when parsed
+            data: Parsed config dict
+        """
+        cache_file = self._parse_cache_file(path)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump({'mtime_ns': mtime_ns, 'data': data}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
+
+    def _flatten(self, nested: dict, prefix: str = '') -> dict:
+        """
+        Flatten a nested dict into dotted-key form.
+
+        Every node is included, so both 'organization' and
+        'organization.mode' resolve; dict values reference the live
+        nested dicts rather than copies.
+
+        Args:
+            nested: Nested configuration dictionary
+            prefix: Dotted prefix for recursive calls
+
+        Returns:
+            Dict mapping dotted key paths to values
+        """
+        flat = {}
+
+        for key, value in nested.items():
+            dotted = f"{prefix}.{key}" if prefix else key
+            flat[dotted] = value
+            if isinstance(value, dict):
+                flat.update(self._flatten(value, dotted))
+
+        return flat
+
     def _deep_update(self, base_dict: dict, update_dict: dict):
         """
         Recursively update a dictionary.
@@ -153,5 +321,7 @@ class Config:
             output_path: Path to save the configuration
             format: Format to use ('yaml' or 'json')
         """
-        self.config = self.DEFAULT_CONFIG.copy()
+        self.config = self._DEFAULT_VIEW
+        self._owns_config = False
+        self._flat = self._flatten(self.config)
         self.save(output_path, format)
@@ -0,0 +1,178 @@
+"""
+SQLite-backed persistence for the File Organization Assistant.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class Database:
+    """Stores file hashes and operation history in SQLite."""
+
+    # SQLite limits the number of bound parameters per statement
+    _PARAM_CHUNK = 900
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the database connection.
+
+        Args:
+            db_path: Path to the SQLite file
+                     (defaults to ~/.fileorganizer/fileorganizer.db)
+        """
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            self.db_path = Path.home() / '.fileorganizer' / 'fileorganizer.db'
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One long-lived connection shared across the scanner's worker
+        # threads; the lock serializes writes (SQLite allows only one
+        # writer anyway)
+        self.conn = sqlite3.connect(str(self.db_path),
+                                    check_same_thread=False)
+        self._write_lock = threading.Lock()
+
+        # WAL keeps readers unblocked during writes and NORMAL halves
+        # the fsyncs; temp tables stay in memory, reads go through a
+        # 256 MiB mmap instead of the pager, and the page cache is
+        # 64 MiB
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+        ''')
+
+        self.init_database()
+
+    def init_database(self):
+        """Create tables if they do not exist."""
+        # WITHOUT ROWID clusters the rows on the (path, algo) key, so
+        # digest lookups are answered from the primary-key btree alone
+        # with no per-row table fetch
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT NOT NULL,
+                algo TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (path, algo)
+            ) WITHOUT ROWID
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_operations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                action TEXT NOT NULL,
+                source TEXT NOT NULL,
+                destination TEXT,
+                status TEXT,
+                error TEXT,
+                timestamp TEXT NOT NULL
+            )
+        ''')
+        self.conn.commit()
+
+    def get_cached_hashes(self, paths: List[str],
+                          algo: str) -> Dict[str, Tuple[int, int, str]]:
+        """
+        Look up cached digests for a batch of paths.
+
+        Args:
+            paths: File paths to look up
+            algo: Hash algorithm the digests must match
+
+        Returns:
+            Dict mapping path to (size, mtime_ns, digest) for rows found
+        """
+        cached = {}
+
+        for i in range(0, len(paths), self._PARAM_CHUNK):
+            chunk = paths[i:i + self._PARAM_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT path, size, mtime_ns, digest FROM file_hashes '
+                f'WHERE algo = ? AND path IN ({placeholders})',
+                [algo] + chunk).fetchall()
+            for path, size, mtime_ns, digest in rows:
+                cached[path] = (size, mtime_ns, digest)
+
+        return cached
+
+    def store_hashes(self, rows: List[Tuple[str, int, int, str]], algo: str):
+        """
+        Store computed digests in one transaction.
+
+        Args:
+            rows: Tuples of (path, size, mtime_ns, digest)
+            algo: Hash algorithm the digests were computed with
+        """
+        with self._write_lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO file_hashes '
+                '(path, algo, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?)',
+                ((path, algo, size, mtime_ns, digest)
+                 for path, size, mtime_ns, digest in rows))
+
+    def log_file_operation(self, action: str, source: str,
+                           destination: Optional[str] = None,
+                           status: Optional[str] = None,
+                           error: Optional[str] = None):
+        """
+        Log a single file operation.
+
+        Prefer log_file_operations_bulk for per-file loops; this commits
+        one row per call.
+
+        Args:
+            action: Operation type (e.g. 'delete_duplicate')
+            source: File the operation applied to
+            destination: Destination path, if any
+            status: Outcome of the operation
+            error: Error message, if the operation failed
+        """
+        with self._write_lock, self.conn:
+            self.conn.execute(
+                'INSERT INTO file_operations '
+                '(action, source, destination, status, error, timestamp) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (action, source, destination, status, error,
+                 datetime.now().isoformat()))
+
+    def log_file_operations_bulk(self, operations: List[Dict]):
+        """
+        Log many file operations in one transaction.
+
+        Accepts the operation records produced by DuplicateManager and
+        FileArchiver; unknown keys are ignored. All rows share a single
+        timestamp and flush with one commit instead of an fsync per row.
+
+        Args:
+            operations: Operation record dicts
+        """
+        if not operations:
+            return
+
+        timestamp = datetime.now().isoformat()
+        with self._write_lock, self.conn:
+            self.conn.executemany(
+                'INSERT INTO file_operations '
+                '(action, source, destination, status, error, timestamp) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(op.get('action'),
+                  op.get('source') or op.get('path'),
+                  op.get('destination'),
+                  op.get('status'),
+                  op.get('error'),
+                  timestamp)
+                 for op in operations])
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
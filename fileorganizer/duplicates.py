@@ -2,11 +2,24 @@
 Duplicate file detection and management.
 """
 
+import errno
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 from collections import defaultdict
 
+# keep_strategy -> (key function, pick the max). Unknown strategies
+# fall through to 'first'. New strategies are an entry here instead of
+# another elif branch in the keeper-picking hot path.
+_KEEP_KEYS = {
+    'newest': (itemgetter('modified'), True),
+    'oldest': (itemgetter('modified'), False),
+    'shortest_path': (lambda f: len(f['path']), False),
+}
+
 
 class DuplicateManager:
     """Manages duplicate file detection and removal."""
@@ -32,27 +45,36 @@ class DuplicateManager:
         """
         return scan_results.get('duplicates', {})
 
-    def analyze_duplicates(self, duplicates: Dict[str, List[Dict]]) -> Dict:
+    def analyze_duplicates(self, duplicates) -> Dict:
         """
         Analyze duplicate files and calculate statistics.
 
+        Accepts either the duplicates dict from FileScanner.scan() or
+        any iterable of (hash, files) pairs; the iterable form is
+        consumed with running counters so arbitrarily large inputs can
+        be analyzed without materializing them.
+
         Args:
-            duplicates: Dictionary of duplicate files
+            duplicates: Dictionary or iterable of duplicate groups
 
         Returns:
             Analysis results including space wasted
         """
+        items = (duplicates.items() if isinstance(duplicates, dict)
+                 else duplicates)
+
         total_duplicates = 0
         wasted_space = 0
-        duplicate_groups = len(duplicates)
+        duplicate_groups = 0
 
-        for hash_val, files in duplicates.items():
+        for hash_val, files in items:
+            duplicate_groups += 1
             if len(files) > 1:
-                # Count all but one as duplicates
-                total_duplicates += len(files) - 1
-                # Calculate wasted space (all duplicates beyond the first)
-                file_size = files[0]['size']
-                wasted_space += file_size * (len(files) - 1)
+                # Count all but one as duplicates; the extras beyond
+                # the first copy are wasted space
+                extra = len(files) - 1
+                total_duplicates += extra
+                wasted_space += files[0]['size'] * extra
 
         return {
             'duplicate_groups': duplicate_groups,
@@ -62,11 +84,64 @@ class DuplicateManager:
             'wasted_space_gb': wasted_space / (1024 * 1024 * 1024)
         }
 
+    @staticmethod
+    def _real_dups(duplicates: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        Drop singleton groups in one pass.
+
+        The scanner already emits only >=2-file groups, so this is
+        usually a no-op pass-through; filtering once here lets the
+        per-group loops below run without a size check per iteration.
+
+        Args:
+            duplicates: Dictionary of duplicate groups
+
+        Returns:
+            The same dict if already free of singletons, else a
+            filtered copy
+        """
+        if all(len(files) > 1 for files in duplicates.values()):
+            return duplicates
+        return {hash_val: files for hash_val, files in duplicates.items()
+                if len(files) > 1}
+
+    @staticmethod
+    def _pick_keeper(files: List[Dict],
+                     keep_strategy: str) -> Tuple[Dict, List[Dict]]:
+        """
+        Choose which file in a duplicate group to keep.
+
+        A single min/max scan replaces the per-group sort: only the
+        keeper matters, so the O(n log n) ordering (and the sorted-list
+        allocation) was wasted work. Strategies dispatch through
+        _KEEP_KEYS rather than an if/elif chain.
+
+        Args:
+            files: Files in the duplicate group
+            keep_strategy: Same strategies as remove_duplicates
+
+        Returns:
+            Tuple of (file to keep, files to remove)
+        """
+        entry = _KEEP_KEYS.get(keep_strategy)
+        if entry is None:  # 'first'
+            keep_file = files[0]
+        else:
+            key, pick_max = entry
+            keep_file = (max if pick_max else min)(files, key=key)
+
+        return keep_file, [f for f in files if f is not keep_file]
+
     def remove_duplicates(self, duplicates: Dict[str, List[Dict]],
-                         keep_strategy: str = 'newest') -> List[Dict]:
+                         keep_strategy: str = 'newest',
+                         workers: int = None) -> List[Dict]:
         """
         Remove duplicate files, keeping one copy based on a strategy.
 
+        Deletions run on a thread pool: unlink is a blocking syscall
+        that releases the GIL, so overlapping them hides per-file
+        latency on slow or networked filesystems.
+
         Args:
             duplicates: Dictionary of duplicate files
             keep_strategy: Strategy for which file to keep
@@ -74,54 +149,67 @@ class DuplicateManager:
                           - 'oldest': Keep the oldest file
                           - 'shortest_path': Keep file with shortest path
                           - 'first': Keep the first file in the list
+            workers: Thread count for deletions (defaults to CPU count,
+                     capped at 8)
 
         Returns:
             List of removal operations
         """
         operations = []
 
-        for hash_val, files in duplicates.items():
-            if len(files) <= 1:
-                continue
-
-            # Determine which file to keep
-            if keep_strategy == 'newest':
-                files_sorted = sorted(files, key=lambda x: x['modified'], reverse=True)
-            elif keep_strategy == 'oldest':
-                files_sorted = sorted(files, key=lambda x: x['modified'])
-            elif keep_strategy == 'shortest_path':
-                files_sorted = sorted(files, key=lambda x: len(x['path']))
-            else:  # 'first'
-                files_sorted = files
-
-            keep_file = files_sorted[0]
-            remove_files = files_sorted[1:]
+        for hash_val, files in self._real_dups(duplicates).items():
+            keep_file, remove_files = self._pick_keeper(files, keep_strategy)
 
             for file_info in remove_files:
-                file_path = Path(file_info['path'])
-
-                operation = {
+                operations.append({
                     'action': 'delete_duplicate',
-                    'path': str(file_path),
+                    'path': file_info['path'],
                     'size': file_info['size'],
                     'kept_file': keep_file['path'],
-                    'hash': hash_val
-                }
+                    'hash': hash_val,
+                    'status': 'simulated' if self.dry_run else 'pending'
+                })
 
-                if not self.dry_run:
-                    try:
-                        file_path.unlink()
-                        operation['status'] = 'deleted'
-                    except (PermissionError, OSError) as e:
-                        operation['status'] = 'failed'
-                        operation['error'] = str(e)
-                else:
-                    operation['status'] = 'simulated'
-
-                operations.append(operation)
+        if not self.dry_run and operations:
+            self._unlink_parallel(operations, workers)
 
         return operations
 
+    @staticmethod
+    def _unlink_parallel(operations: List[Dict], workers: int = None):
+        """
+        Unlink the files named by a batch of operations.
+
+        Each operation's status is updated in place to 'deleted' or
+        'failed' (with the error message).
+
+        Args:
+            operations: Pending delete operations
+            workers: Thread count (defaults to CPU count, capped at 8)
+        """
+        if workers is None:
+            workers = min(8, os.cpu_count() or 1)
+
+        def unlink_one(operation):
+            # Raw os call on the path string; no Path object needed in
+            # this syscall-bound loop
+            try:
+                os.unlink(operation['path'])
+                operation['status'] = 'deleted'
+            except (PermissionError, OSError) as e:
+                operation['status'] = 'failed'
+                operation['error'] = str(e)
+
+        if workers <= 1 or len(operations) == 1:
+            for operation in operations:
+                unlink_one(operation)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the iterator so all deletions finish before return
+            for _ in executor.map(unlink_one, operations):
+                pass
+
     def move_duplicates(self, duplicates: Dict[str, List[Dict]],
                        target_dir: str,
                        keep_strategy: str = 'newest') -> List[Dict]:
@@ -142,38 +230,39 @@ class DuplicateManager:
         if not self.dry_run:
             target_path.mkdir(parents=True, exist_ok=True)
 
-        for hash_val, files in duplicates.items():
-            if len(files) <= 1:
-                continue
+        # Index the target directory once; each exists() probe in the
+        # old conflict loop was a stat syscall, quadratic when many
+        # duplicates share a basename
+        try:
+            with os.scandir(target_dir) as entries:
+                existing = {entry.name for entry in entries}
+        except OSError:
+            existing = set()
 
-            # Determine which file to keep
-            if keep_strategy == 'newest':
-                files_sorted = sorted(files, key=lambda x: x['modified'], reverse=True)
-            elif keep_strategy == 'oldest':
-                files_sorted = sorted(files, key=lambda x: x['modified'])
-            elif keep_strategy == 'shortest_path':
-                files_sorted = sorted(files, key=lambda x: len(x['path']))
-            else:
-                files_sorted = files
-
-            keep_file = files_sorted[0]
-            move_files = files_sorted[1:]
+        for hash_val, files in self._real_dups(duplicates).items():
+            keep_file, move_files = self._pick_keeper(files, keep_strategy)
 
             for file_info in move_files:
-                source_path = Path(file_info['path'])
-                dest_path = target_path / source_path.name
-
-                # Handle name conflicts
-                counter = 1
-                original_dest = dest_path
-                while dest_path.exists():
-                    dest_path = target_path / f"{original_dest.stem}_{counter}{original_dest.suffix}"
-                    counter += 1
+                # C-level basename/splitext on the raw string; Path
+                # construction re-parses the path per file
+                source = file_info['path']
+                dest_name = os.path.basename(source)
+
+                # Handle name conflicts against the in-memory index
+                if dest_name in existing:
+                    stem, suffix = os.path.splitext(dest_name)
+                    counter = 1
+                    while f"{stem}_{counter}{suffix}" in existing:
+                        counter += 1
+                    dest_name = f"{stem}_{counter}{suffix}"
+
+                existing.add(dest_name)
+                destination = os.path.join(target_dir, dest_name)
 
                 operation = {
                     'action': 'move_duplicate',
-                    'source': str(source_path),
-                    'destination': str(dest_path),
+                    'source': source,
+                    'destination': destination,
                     'size': file_info['size'],
                     'kept_file': keep_file['path'],
                     'hash': hash_val
@@ -181,8 +270,15 @@ class DuplicateManager:
 
                 if not self.dry_run:
                     try:
-                        import shutil
-                        shutil.move(str(source_path), str(dest_path))
+                        # Same-filesystem moves (the common case) are a
+                        # single rename syscall; only cross-device
+                        # moves need shutil's copy+unlink fallback
+                        try:
+                            os.rename(source, destination)
+                        except OSError as e:
+                            if e.errno != errno.EXDEV:
+                                raise
+                            shutil.move(source, destination)
                         operation['status'] = 'moved'
                     except (PermissionError, OSError) as e:
                         operation['status'] = 'failed'
@@ -206,31 +302,50 @@ class DuplicateManager:
         Returns:
             Path to the report file
         """
-        analysis = self.analyze_duplicates(duplicates)
-
-        with open(output_file, 'w') as f:
-            f.write("DUPLICATE FILES REPORT\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(f"Total duplicate groups: {analysis['duplicate_groups']}\n")
-            f.write(f"Total duplicate files: {analysis['total_duplicate_files']}\n")
-            f.write(f"Wasted space: {analysis['wasted_space_mb']:.2f} MB ")
-            f.write(f"({analysis['wasted_space_gb']:.2f} GB)\n\n")
-            f.write("=" * 80 + "\n\n")
-
-            for i, (hash_val, files) in enumerate(duplicates.items(), 1):
-                if len(files) <= 1:
-                    continue
-
-                f.write(f"Duplicate Group #{i}\n")
-                f.write(f"Hash: {hash_val}\n")
-                f.write(f"Size: {files[0]['size']:,} bytes\n")
-                f.write(f"Count: {len(files)} copies\n")
-                f.write(f"Wasted space: {files[0]['size'] * (len(files) - 1):,} bytes\n\n")
-
-                for j, file_info in enumerate(files, 1):
-                    f.write(f"  {j}. {file_info['path']}\n")
-                    f.write(f"     Modified: {file_info['modified']}\n")
-
-                f.write("\n" + "-" * 80 + "\n\n")
+        # One fused pass: accumulate the statistics while building the
+        # group sections, instead of a full analyze pass followed by a
+        # second iteration over the same dict
+        separator = "\n" + "-" * 80 + "\n\n"
+        sections = []
+        total_duplicates = 0
+        wasted_space = 0
+        real_dups = self._real_dups(duplicates)
+
+        for i, (hash_val, files) in enumerate(real_dups.items(), 1):
+            count = len(files)
+            size = files[0]['size']
+            extra = count - 1
+            total_duplicates += extra
+            wasted_space += size * extra
+
+            lines = [
+                f"Duplicate Group #{i}\n",
+                f"Hash: {hash_val}\n",
+                f"Size: {size:,} bytes\n",
+                f"Count: {count} copies\n",
+                f"Wasted space: {size * extra:,} bytes\n\n",
+            ]
+            for j, file_info in enumerate(files, 1):
+                lines.append(f"  {j}. {file_info['path']}\n")
+                lines.append(f"     Modified: {file_info['modified']}\n")
+            lines.append(separator)
+            sections.append(''.join(lines))
+
+        header = (
+            "DUPLICATE FILES REPORT\n"
+            + "=" * 80 + "\n\n"
+            + f"Total duplicate groups: {len(real_dups)}\n"
+            + f"Total duplicate files: {total_duplicates}\n"
+            + f"Wasted space: {wasted_space / (1024 * 1024):.2f} MB "
+            + f"({wasted_space / (1024 * 1024 * 1024):.2f} GB)\n\n"
+            + "=" * 80 + "\n\n"
+        )
+
+        # 256 KiB buffer: the default 8 KiB text buffer flushes every
+        # few groups on large reports
+        with open(output_file, 'w', encoding='utf-8',
+                  buffering=262144) as f:
+            f.write(header)
+            f.write(''.join(sections))
 
         return output_file
@@ -0,0 +1,100 @@
+"""
+Logging helpers for the File Organization Assistant.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import sys
+from typing import Optional
+
+# Module-scope logger cache so call sites don't pay the manager lock
+# and dict lookup inside logging.getLogger on every call
+_loggers = {}
+
+# One Formatter shared by every handler; records whether (and with
+# which log file) setup_logging already ran so repeated calls don't
+# stack duplicate handlers or leak file descriptors
+_FORMATTER = logging.Formatter(
+    '%(asctime)s %(name)s %(levelname)s: %(message)s')
+_configured_log_file = None
+_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger by name, caching lookups.
+
+    Args:
+        name: Logger name (usually __name__)
+
+    Returns:
+        The cached Logger instance
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = logging.getLogger(name)
+    return logger
+
+
+def setup_logging(level: int = logging.WARNING,
+                  log_file: Optional[str] = None) -> logging.Logger:
+    """
+    Configure logging for CLI runs.
+
+    Safe to call repeatedly: if the handlers are already set up for the
+    same log file, only the level is updated, so reconfiguring (e.g. in
+    long-running processes) does not stack duplicate handlers or reopen
+    the log file.
+
+    Args:
+        level: Logging level for the package logger
+        log_file: Optional file to also write log records to
+
+    Returns:
+        The configured package logger
+    """
+    global _configured, _configured_log_file
+
+    root = get_logger('fileorganizer')
+    root.setLevel(level)
+
+    if _configured and log_file == _configured_log_file:
+        return root
+
+    # A different log file (or first call): rebuild the handler set,
+    # closing any old ones so their file descriptors are released
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        # MemoryHandler.close flushes but leaves its wrapped file
+        # handler open; close that too so the old fd is released
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(_FORMATTER)
+    root.addHandler(handler)
+
+    if log_file:
+        # Buffer file records in memory: FileHandler writes (a syscall
+        # under the handler lock) per record, which serializes the
+        # scanner's worker threads under verbose logging. The buffer
+        # flushes every 1024 records, immediately on WARNING and
+        # above, and at interpreter exit.
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(_FORMATTER)
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=1024, flushLevel=logging.WARNING,
+            target=file_handler)
+        root.addHandler(memory_handler)
+        atexit.register(memory_handler.flush)
+
+    _configured = True
+    _configured_log_file = log_file
+
+    # %-style args defer formatting until a handler accepts the record
+    root.debug("Logging initialized - log file: %s", log_file)
+
+    return root